@@ -378,6 +378,9 @@ class TTSExecutor(BaseExecutor):
         self.am_time = 0
         self.voc_time = 0
         flags = 0
+        # multi speaker
+        if am_dataset in {"aishell3", "vctk"}:
+            spk_id_tensor = paddle.to_tensor(spk_id)
         for i in range(len(phone_ids)):
             am_st = time.time()
             part_phone_ids = phone_ids[i]
@@ -390,7 +393,7 @@ class TTSExecutor(BaseExecutor):
                 # multi speaker
                 if am_dataset in {"aishell3", "vctk"}:
                     mel = self.am_inference(
-                        part_phone_ids, spk_id=paddle.to_tensor(spk_id))
+                        part_phone_ids, spk_id=spk_id_tensor)
                 else:
                     mel = self.am_inference(part_phone_ids)
             self.am_time += (time.time() - am_st)
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import base64
+import functools
 import math
 import os
 import time
@@ -24,10 +25,11 @@ from .pretrained_models import pretrained_models
 from paddlespeech.cli.log import logger
 from paddlespeech.cli.tts.infer import TTSExecutor
 from paddlespeech.server.engine.base_engine import BaseEngine
-from paddlespeech.server.utils.audio_process import float2pcm
+from paddlespeech.server.utils.audio_process import encode_pcm_chunk
 from paddlespeech.server.utils.onnx_infer import get_sess
 from paddlespeech.server.utils.util import denorm
 from paddlespeech.server.utils.util import get_chunks
+from paddlespeech.server.utils.util import get_depadding_slices
 from paddlespeech.t2s.frontend import English
 from paddlespeech.t2s.frontend.zh_frontend import Frontend
 
@@ -44,6 +46,9 @@ class TTSServerExecutor(TTSExecutor):
         self.voc_upsample = voc_upsample
 
         self.pretrained_models = pretrained_models
+        # frontend results of recent sentences, cached as numpy arrays on cpu
+        self.get_phone_ids = functools.lru_cache(
+            maxsize=1024)(self._get_phone_ids)
 
     def _init_from_path(
             self,
@@ -178,6 +183,34 @@ class TTSServerExecutor(TTSExecutor):
 
         return data
 
+    def _get_phone_ids(self,
+                       text: str,
+                       lang: str,
+                       merge_sentences: bool,
+                       get_tone_ids: bool):
+        """Frontend of the text, it is deterministic in the arguments and
+        cached by self.get_phone_ids.
+
+        Returns:
+            tuple: read-only phone ids (numpy.ndarray) of every sentence
+        """
+        if lang == 'zh':
+            input_ids = self.frontend.get_input_ids(
+                text,
+                merge_sentences=merge_sentences,
+                get_tone_ids=get_tone_ids)
+        elif lang == 'en':
+            input_ids = self.frontend.get_input_ids(
+                text, merge_sentences=merge_sentences)
+        else:
+            logger.error("lang should in {'zh', 'en'}!")
+            return ()
+        phone_ids = tuple(ids.numpy() for ids in input_ids["phone_ids"])
+        # the cached arrays are shared by all the requests
+        for ids in phone_ids:
+            ids.flags.writeable = False
+        return phone_ids
+
     @paddle.no_grad()
     def infer(
             self,
@@ -202,25 +235,13 @@ class TTSServerExecutor(TTSExecutor):
 
         # front 
         frontend_st = time.time()
-        if lang == 'zh':
-            input_ids = self.frontend.get_input_ids(
-                text,
-                merge_sentences=merge_sentences,
-                get_tone_ids=get_tone_ids)
-            phone_ids = input_ids["phone_ids"]
-            if get_tone_ids:
-                tone_ids = input_ids["tone_ids"]
-        elif lang == 'en':
-            input_ids = self.frontend.get_input_ids(
-                text, merge_sentences=merge_sentences)
-            phone_ids = input_ids["phone_ids"]
-        else:
-            logger.error("lang should in {'zh', 'en'}!")
+        phone_ids = self.get_phone_ids(text, lang, merge_sentences,
+                                       get_tone_ids)
         frontend_et = time.time()
         self.frontend_time = frontend_et - frontend_st
 
-        for i in range(len(phone_ids)):
-            part_phone_ids = phone_ids[i].numpy()
+        for sent_id in range(len(phone_ids)):
+            part_phone_ids = phone_ids[sent_id]
             voc_chunk_id = 0
 
             # fastspeech2_csmsc
@@ -237,11 +258,12 @@ class TTSServerExecutor(TTSExecutor):
                 mel_chunks = get_chunks(mel, voc_block, voc_pad, "voc")
                 voc_chunk_num = len(mel_chunks)
                 voc_st = time.time()
-                for i, mel_chunk in enumerate(mel_chunks):
+                voc_slices = get_depadding_slices(voc_chunk_num, voc_block,
+                                                  voc_pad, voc_upsample)
+                for chunk_id, mel_chunk in enumerate(mel_chunks):
                     sub_wav = self.voc_sess.run(
                         output_names=None, input_feed={'logmel': mel_chunk})
-                    sub_wav = self.depadding(sub_wav[0], voc_chunk_num, i,
-                                             voc_block, voc_pad, voc_upsample)
+                    sub_wav = sub_wav[0][voc_slices[chunk_id]]
                     if first_flag == 1:
                         first_voc_et = time.time()
                         self.first_voc_infer = first_voc_et - first_am_et
@@ -260,13 +282,15 @@ class TTSServerExecutor(TTSExecutor):
                 # streaming voc chunk info
                 mel_len = orig_hs.shape[1]
                 voc_chunk_num = math.ceil(mel_len / self.voc_block)
+                voc_slices = get_depadding_slices(voc_chunk_num, voc_block,
+                                                  voc_pad, voc_upsample)
                 start = 0
                 end = min(self.voc_block + self.voc_pad, mel_len)
 
                 # streaming am
                 hss = get_chunks(orig_hs, self.am_block, self.am_pad, "am")
                 am_chunk_num = len(hss)
-                for i, hs in enumerate(hss):
+                for am_chunk_id, hs in enumerate(hss):
                     am_decoder_output = self.am_decoder_sess.run(
                         None, input_feed={'xs': hs})
                     am_postnet_output = self.am_postnet_sess.run(
@@ -279,10 +303,10 @@ class TTSServerExecutor(TTSExecutor):
                     normalized_mel = am_output_data[0][0]
 
                     sub_mel = denorm(normalized_mel, self.am_mu, self.am_std)
-                    sub_mel = self.depadding(sub_mel, am_chunk_num, i, am_block,
-                                             am_pad, am_upsample)
+                    sub_mel = self.depadding(sub_mel, am_chunk_num, am_chunk_id,
+                                             am_block, am_pad, am_upsample)
 
-                    if i == 0:
+                    if am_chunk_id == 0:
                         mel_streaming = sub_mel
                     else:
                         mel_streaming = np.concatenate(
@@ -299,9 +323,7 @@ class TTSServerExecutor(TTSExecutor):
 
                         sub_wav = self.voc_sess.run(
                             output_names=None, input_feed={'logmel': voc_chunk})
-                        sub_wav = self.depadding(sub_wav[0], voc_chunk_num,
-                                                 voc_chunk_id, voc_block,
-                                                 voc_pad, voc_upsample)
+                        sub_wav = sub_wav[0][voc_slices[voc_chunk_id]]
                         if first_flag == 1:
                             first_voc_et = time.time()
                             self.first_voc_infer = first_voc_et - first_am_et
@@ -349,6 +371,11 @@ class TTSEngine(BaseEngine):
             self.config.voc_block > 0 and self.config.voc_pad > 0
         ), "Please set correct voc_block and voc_pad, they should be more than 0."
 
+        self.stream_encoding = self.config.get('stream_encoding', 'base64')
+        assert self.stream_encoding in {
+            'base64', 'pcm'
+        }, "Please set correct stream_encoding, it should be base64 or pcm."
+
         assert (
             self.config.voc_sample_rate == self.config.am_sample_rate
         ), "The sample rate of AM and Vocoder model are different, please check model."
@@ -395,6 +422,10 @@ class TTSEngine(BaseEngine):
                          (self.config.voc_sess_conf.device))
             return False
 
+        # size of the buffers to convert the streaming wav chunks to pcm
+        voc_chunk_size = self.config.voc_block + 2 * self.config.voc_pad
+        self.max_chunk_samples = voc_chunk_size * self.config.voc_upsample
+
         # warm up
         try:
             self.warm_up()
@@ -427,10 +458,10 @@ class TTSEngine(BaseEngine):
                 )
                 break
 
-    def preprocess(self, text_bese64: str=None, text_bytes: bytes=None):
+    def preprocess(self, text_b64: str=None, text_bytes: bytes=None):
         # Convert byte to text
-        if text_bese64:
-            text_bytes = base64.b64decode(text_bese64)  # base64 to bytes
+        if text_b64:
+            text_bytes = base64.b64decode(text_b64)  # base64 to bytes
         text = text_bytes.decode('utf-8')  # bytes to text
 
         return text
@@ -455,9 +486,13 @@ class TTSEngine(BaseEngine):
             None means do not save audio. Defaults to None.
 
         Returns:
-            wav_base64: The base64 format of the synthesized audio.
+            wav_base64: The base64 format of the synthesized audio, or the pcm
+            bytes if stream_encoding is pcm.
         """
-        wav_list = []
+        wav_len = 0
+        # buffers to convert the wav chunks of this request to pcm
+        float_buf = np.empty(self.max_chunk_samples, dtype=np.float32)
+        pcm_buf = np.empty(self.max_chunk_samples, dtype=np.int16)
 
         for wav in self.executor.infer(
                 text=sentence,
@@ -466,15 +501,11 @@ class TTSEngine(BaseEngine):
                 spk_id=spk_id, ):
 
             # wav type: <class 'numpy.ndarray'>  float32, convert to pcm (base64)
-            wav = float2pcm(wav)  # float32 to int16
-            wav_bytes = wav.tobytes()  # to bytes
-            wav_base64 = base64.b64encode(wav_bytes).decode('utf8')  # to base64
-            wav_list.append(wav)
-
-            yield wav_base64
+            yield encode_pcm_chunk(wav, float_buf, pcm_buf,
+                                   self.stream_encoding)
+            wav_len += wav.shape[0]
 
-        wav_all = np.concatenate(wav_list, axis=0)
-        duration = len(wav_all) / self.config.voc_sample_rate
+        duration = wav_len / self.config.voc_sample_rate
         logger.info(f"sentence: {sentence}")
         logger.info(f"The durations of audio is: {duration} s")
         logger.info(
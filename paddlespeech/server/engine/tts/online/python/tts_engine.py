@@ -12,23 +12,35 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import base64
+import functools
 import math
 import os
+import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 import numpy as np
 import paddle
 import yaml
+from paddle import jit
+from paddle import nn
+from paddle.device.cuda.graphs import CUDAGraph
+from paddle.device.cuda.graphs import is_cuda_graph_supported
+from paddle.static import InputSpec
 from yacs.config import CfgNode
 
 from .pretrained_models import pretrained_models
 from paddlespeech.cli.log import logger
 from paddlespeech.cli.tts.infer import TTSExecutor
 from paddlespeech.server.engine.base_engine import BaseEngine
-from paddlespeech.server.utils.audio_process import float2pcm
+from paddlespeech.server.utils.audio_process import encode_pcm_chunk
+from paddlespeech.server.utils.paddle_predictor import init_predictor
+from paddlespeech.server.utils.paddle_predictor import run_model
 from paddlespeech.server.utils.util import denorm
 from paddlespeech.server.utils.util import get_chunks
+from paddlespeech.server.utils.util import get_depadding_slices
 from paddlespeech.t2s.frontend import English
 from paddlespeech.t2s.frontend.zh_frontend import Frontend
 from paddlespeech.t2s.modules.normalizer import ZScore
@@ -37,6 +49,38 @@ from paddlespeech.utils.dynamic_import import dynamic_import
 __all__ = ['TTSEngine']
 
 
+class VocBatchInference(nn.Layer):
+    """Vocoder inference for a batch of mel chunks with the same length,
+    support mb_melgan and hifigan.
+    """
+
+    def __init__(self, voc_inference, voc_name: str):
+        super().__init__()
+        self.voc_inference = voc_inference
+        self.voc_name = voc_name
+
+    def forward(self, mel_batch):
+        """
+        Args:
+            mel_batch (Tensor): mel chunks, shape (B, T, n_mels)
+
+        Returns:
+            Tensor: wavs, shape (B, T * upsample, 1)
+        """
+        normalized_mel = self.voc_inference.normalizer(mel_batch)
+        # (B, n_mels, T)
+        normalized_mel = normalized_mel.transpose([0, 2, 1])
+        if self.voc_name == "mb_melgan":
+            generator = self.voc_inference.melgan_generator
+            wavs = generator.melgan(normalized_mel)
+            if generator.pqmf is not None:
+                wavs = generator.pqmf(wavs)
+        else:
+            wavs = self.voc_inference.hifigan_generator(normalized_mel)
+        # (B, T * upsample, 1)
+        return wavs.transpose([0, 2, 1])
+
+
 class TTSServerExecutor(TTSExecutor):
     def __init__(self, am_block, am_pad, voc_block, voc_pad):
         super().__init__()
@@ -45,6 +89,15 @@ class TTSServerExecutor(TTSExecutor):
         self.voc_block = voc_block
         self.voc_pad = voc_pad
         self.pretrained_models = pretrained_models
+        # frontend results of recent sentences, cached as numpy arrays on cpu
+        self.get_phone_ids = functools.lru_cache(
+            maxsize=1024)(self._get_phone_ids)
+        # cuda graphs of voc inference captured at init, key is
+        # (voc function, input shape)
+        self.voc_cuda_graph = False
+        self.voc_graphs = {}
+        # batch sizes of the captured graphs of the batched voc inference
+        self.voc_batch_buckets = (1, 2, 4, 8)
 
     def get_model_info(self,
                        field: str,
@@ -163,6 +216,7 @@ class TTSServerExecutor(TTSExecutor):
             self.am_config = CfgNode(yaml.safe_load(f))
         with open(self.voc_config) as f:
             self.voc_config = CfgNode(yaml.safe_load(f))
+        self.voc_upsample = self.voc_config.n_shift
 
         with open(self.phones_dict, "r") as f:
             phn_id = [line.strip().split() for line in f.readlines()]
@@ -203,8 +257,67 @@ class TTSServerExecutor(TTSExecutor):
                                              self.model_alias)
         self.voc_inference = voc_inference_class(voc_normalizer, voc)
         self.voc_inference.eval()
+        self.voc_batch_inference = VocBatchInference(self.voc_inference,
+                                                     self.voc_name)
+        self.voc_batch_inference.eval()
         print("voc done!")
 
+    def predictor_inference(self, model, input_spec, model_dir, predictor_conf):
+        """Save model as static model and create a paddle inference predictor for it
+
+        Args:
+            model (nn.Layer): model to be saved
+            input_spec (list): input spec of the static model
+            model_dir (str): dir to save the static model
+            predictor_conf (dict): the configuration parameters of predictor
+
+        Returns:
+            callable: run the predictor with a tensor input and return a tensor
+        """
+        model_name = type(model).__name__
+        model = jit.to_static(model, input_spec=input_spec)
+        jit.save(model, os.path.join(model_dir, model_name))
+        predictor = init_predictor(
+            model_file=os.path.join(model_dir, model_name + ".pdmodel"),
+            params_file=os.path.join(model_dir, model_name + ".pdiparams"),
+            predictor_conf=predictor_conf)
+        # predictor is not thread safe
+        lock = threading.Lock()
+
+        def inference(data):
+            with lock:
+                output = run_model(predictor, [data.numpy()])[0]
+            return paddle.to_tensor(output)
+
+        return inference
+
+    def init_cpu_predictors(self, am: str, predictor_conf: dict):
+        """Run am and voc with paddle inference predictors on cpu, am is only
+        replaced for fastspeech2_csmsc, the models of fastspeech2_cnndecoder_csmsc
+        are called layer by layer. Both the batched and the single chunk voc
+        inference are replaced.
+
+        Args:
+            am (str): am model type
+            predictor_conf (dict): the configuration parameters of predictor
+        """
+        n_mels = self.am_config.n_mels
+        # the predictors load the models when created, so the dir can be removed
+        with tempfile.TemporaryDirectory() as model_dir:
+            if am == "fastspeech2_csmsc":
+                self.am_inference = self.predictor_inference(
+                    self.am_inference, [InputSpec([-1], dtype=paddle.int64)],
+                    model_dir, predictor_conf)
+                self.voc_batch_inference = self.predictor_inference(
+                    self.voc_batch_inference,
+                    [InputSpec([-1, -1, n_mels], dtype=paddle.float32)],
+                    model_dir, predictor_conf)
+            # the single voc chunks, e.g. the first chunk of fastspeech2_csmsc
+            self.voc_inference = self.predictor_inference(
+                self.voc_inference,
+                [InputSpec([-1, n_mels], dtype=paddle.float32)], model_dir,
+                predictor_conf)
+
     def depadding(self, data, chunk_num, chunk_id, block, pad, upsample):
         """ 
         Streaming inference removes the result of pad inference
@@ -222,6 +335,169 @@ class TTSServerExecutor(TTSExecutor):
 
         return data
 
+    def _get_phone_ids(self,
+                       text: str,
+                       lang: str,
+                       merge_sentences: bool,
+                       get_tone_ids: bool):
+        """Frontend of the text, it is deterministic in the arguments and
+        cached by self.get_phone_ids.
+
+        Returns:
+            tuple: read-only phone ids (numpy.ndarray) of every sentence
+        """
+        if lang == 'zh':
+            input_ids = self.frontend.get_input_ids(
+                text,
+                merge_sentences=merge_sentences,
+                get_tone_ids=get_tone_ids)
+        elif lang == 'en':
+            input_ids = self.frontend.get_input_ids(
+                text, merge_sentences=merge_sentences)
+        else:
+            print("lang should in {'zh', 'en'}!")
+            return ()
+        phone_ids = tuple(ids.numpy() for ids in input_ids["phone_ids"])
+        # the cached arrays are shared by all the requests
+        for ids in phone_ids:
+            ids.flags.writeable = False
+        return phone_ids
+
+    def voc_graph_key(self, voc_fn, shape):
+        return (getattr(voc_fn, '__name__', type(voc_fn).__name__),
+                tuple(shape))
+
+    @paddle.no_grad()
+    def capture_voc_graph(self, voc_fn, shape):
+        """Capture a cuda graph of voc_fn for the input shape.
+        """
+        static_input = paddle.zeros(shape, dtype=paddle.float32)
+        # run once before capturing to initialize the kernels
+        voc_fn(static_input)
+        graph = CUDAGraph()
+        graph.capture_begin()
+        static_output = voc_fn(static_input)
+        graph.capture_end()
+        self.voc_graphs[self.voc_graph_key(voc_fn, shape)] = (
+            graph, static_input, static_output, threading.Lock())
+
+    def init_voc_graphs(self, am: str):
+        """Capture the cuda graphs of voc inference for the full length voc
+        chunks (voc_block + 2 * voc_pad frames) before the server handles any
+        request. The batched voc inference of fastspeech2_csmsc gets a graph
+        for each batch size in self.voc_batch_buckets, and the chunk voc
+        inference of fastspeech2_cnndecoder_csmsc gets one graph.
+        """
+        n_mels = self.am_config.n_mels
+        full_len = self.voc_block + 2 * self.voc_pad
+        if am == "fastspeech2_csmsc":
+            for batch_size in self.voc_batch_buckets:
+                self.capture_voc_graph(self.voc_batch_inference,
+                                       [batch_size, full_len, n_mels])
+        elif am == "fastspeech2_cnndecoder_csmsc":
+            self.capture_voc_graph(self.voc_inference, [full_len, n_mels])
+
+    def voc_graph_inference(self, voc_fn, mel):
+        """Run voc_fn(mel) by replaying the cuda graph captured for the shape
+        of mel, voc_fn(mel) is called directly if there is no such graph.
+
+        Args:
+            voc_fn (callable): vocoder inference function
+            mel (Tensor): input of voc_fn
+
+        Returns:
+            Tensor: output of voc_fn
+        """
+        key = self.voc_graph_key(voc_fn, mel.shape)
+        if not self.voc_cuda_graph or key not in self.voc_graphs:
+            return voc_fn(mel)
+
+        graph, static_input, static_output, lock = self.voc_graphs[key]
+        # the static tensors are shared by the requests, they are used by
+        # one request at a time
+        with lock:
+            paddle.assign(mel, output=static_input)
+            graph.replay()
+            # static_output is overwritten by the next replay
+            return static_output.clone()
+
+    def voc_full_chunks_inference(self, mel_chunks):
+        """Batched vocoder inference for the full length voc chunks. With cuda
+        graphs, the chunks are split into batches of at most the largest size
+        in self.voc_batch_buckets, and each batch is filled with zero chunks up
+        to a size in self.voc_batch_buckets to replay a captured graph.
+
+        Args:
+            mel_chunks (list): mel chunks, shape (T, n_mels),
+                T = voc_block + 2 * voc_pad
+
+        Returns:
+            list: wav of each chunk, shape (T * upsample, 1)
+        """
+        if not self.voc_cuda_graph:
+            return list(self.voc_batch_inference(paddle.stack(mel_chunks)))
+
+        wavs = []
+        max_batch_size = self.voc_batch_buckets[-1]
+        for start in range(0, len(mel_chunks), max_batch_size):
+            mel_batch = paddle.stack(mel_chunks[start:start + max_batch_size])
+            batch_size = mel_batch.shape[0]
+            bucket = min(b for b in self.voc_batch_buckets if b >= batch_size)
+            if bucket > batch_size:
+                fill = paddle.zeros(
+                    [bucket - batch_size] + mel_batch.shape[1:],
+                    dtype=mel_batch.dtype)
+                mel_batch = paddle.concat([mel_batch, fill])
+            batch_wavs = self.voc_graph_inference(self.voc_batch_inference,
+                                                  mel_batch)
+            wavs.extend(batch_wavs[i] for i in range(batch_size))
+        return wavs
+
+    def voc_chunks_inference(self, mel):
+        """Vocoder inference for all chunks of one sentence. The first chunk is
+        inferred and yielded on its own, so the first response does not wait
+        for the other chunks. The chunks with the full length
+        voc_block + 2 * voc_pad are inferred with one batched call, the others
+        (the last chunks) are inferred on their own, so the result is the same
+        as inferring the chunks one by one.
+
+        Args:
+            mel (Tensor): mel of one sentence, shape (T, n_mels)
+
+        Yields:
+            Tensor: depadded wav of each chunk, shape (T_i * upsample, 1)
+        """
+        mel_chunks = get_chunks(mel, self.voc_block, self.voc_pad, "voc")
+        chunk_num = len(mel_chunks)
+        voc_slices = get_depadding_slices(chunk_num, self.voc_block,
+                                          self.voc_pad, self.voc_upsample)
+
+        # the first chunk is never full length
+        yield self.voc_inference(mel_chunks[0])[voc_slices[0]]
+
+        full_len = self.voc_block + 2 * self.voc_pad
+        full_ids = [
+            chunk_id for chunk_id in range(1, chunk_num)
+            if mel_chunks[chunk_id].shape[0] == full_len
+        ]
+        wavs = {}
+        if len(full_ids) > 0:
+            batch_wavs = self.voc_full_chunks_inference(
+                [mel_chunks[chunk_id] for chunk_id in full_ids])
+            wavs = dict(zip(full_ids, batch_wavs))
+        for chunk_id in range(1, chunk_num):
+            wav = wavs.get(chunk_id)
+            if wav is None:
+                wav = self.voc_inference(mel_chunks[chunk_id])
+            yield wav[voc_slices[chunk_id]]
+
+    @paddle.no_grad()
+    def am_sentence_inference(self, part_phone_ids):
+        """Acoustic model inference of one sentence, run in the am thread of
+        the request
+        """
+        return self.am_inference(paddle.to_tensor(part_phone_ids))
+
     @paddle.no_grad()
     def infer(
             self,
@@ -238,101 +514,48 @@ class TTSServerExecutor(TTSExecutor):
         am_upsample = 1
         voc_block = self.voc_block
         voc_pad = self.voc_pad
-        voc_upsample = self.voc_config.n_shift
+        voc_upsample = self.voc_upsample
         # first_flag 用于标记首包
         first_flag = 1
 
         get_tone_ids = False
         merge_sentences = False
         frontend_st = time.time()
-        if lang == 'zh':
-            input_ids = self.frontend.get_input_ids(
-                text,
-                merge_sentences=merge_sentences,
-                get_tone_ids=get_tone_ids)
-            phone_ids = input_ids["phone_ids"]
-            if get_tone_ids:
-                tone_ids = input_ids["tone_ids"]
-        elif lang == 'en':
-            input_ids = self.frontend.get_input_ids(
-                text, merge_sentences=merge_sentences)
-            phone_ids = input_ids["phone_ids"]
-        else:
-            print("lang should in {'zh', 'en'}!")
+        phone_ids = self.get_phone_ids(text, lang, merge_sentences,
+                                       get_tone_ids)
         frontend_et = time.time()
         self.frontend_time = frontend_et - frontend_st
 
-        for i in range(len(phone_ids)):
-            part_phone_ids = phone_ids[i]
-            voc_chunk_id = 0
+        # am inference of the next sentence runs in a thread owned by this
+        # request while the vocoder is inferring the current sentence
+        am_pool = None
+        if am == "fastspeech2_csmsc" and len(phone_ids) > 0:
+            am_pool = ThreadPoolExecutor(max_workers=1)
+            mel_future = am_pool.submit(self.am_sentence_inference,
+                                        phone_ids[0])
 
-            # fastspeech2_csmsc
-            if am == "fastspeech2_csmsc":
-                # am 
-                mel = self.am_inference(part_phone_ids)
-                if first_flag == 1:
-                    first_am_et = time.time()
-                    self.first_am_infer = first_am_et - frontend_et
-
-                # voc streaming
-                mel_chunks = get_chunks(mel, voc_block, voc_pad, "voc")
-                voc_chunk_num = len(mel_chunks)
-                voc_st = time.time()
-                for i, mel_chunk in enumerate(mel_chunks):
-                    sub_wav = self.voc_inference(mel_chunk)
-                    sub_wav = self.depadding(sub_wav, voc_chunk_num, i,
-                                             voc_block, voc_pad, voc_upsample)
+        try:
+            for sent_id in range(len(phone_ids)):
+                part_phone_ids = phone_ids[sent_id]
+                voc_chunk_id = 0
+
+                # fastspeech2_csmsc
+                if am == "fastspeech2_csmsc":
+                    # am 
+                    mel = mel_future.result()
+                    # am of the next sentence overlaps with voc of this sentence
+                    if sent_id + 1 < len(phone_ids):
+                        mel_future = am_pool.submit(self.am_sentence_inference,
+                                                    phone_ids[sent_id + 1])
                     if first_flag == 1:
-                        first_voc_et = time.time()
-                        self.first_voc_infer = first_voc_et - first_am_et
-                        self.first_response_time = first_voc_et - frontend_st
-                        first_flag = 0
-
-                    yield sub_wav
-
-            # fastspeech2_cnndecoder_csmsc 
-            elif am == "fastspeech2_cnndecoder_csmsc":
-                # am 
-                orig_hs = self.am_inference.encoder_infer(part_phone_ids)
-
-                # streaming voc chunk info
-                mel_len = orig_hs.shape[1]
-                voc_chunk_num = math.ceil(mel_len / self.voc_block)
-                start = 0
-                end = min(self.voc_block + self.voc_pad, mel_len)
-
-                # streaming am
-                hss = get_chunks(orig_hs, self.am_block, self.am_pad, "am")
-                am_chunk_num = len(hss)
-                for i, hs in enumerate(hss):
-                    before_outs = self.am_inference.decoder(hs)
-                    after_outs = before_outs + self.am_inference.postnet(
-                        before_outs.transpose((0, 2, 1))).transpose((0, 2, 1))
-                    normalized_mel = after_outs[0]
-                    sub_mel = denorm(normalized_mel, self.am_mu, self.am_std)
-                    sub_mel = self.depadding(sub_mel, am_chunk_num, i, am_block,
-                                             am_pad, am_upsample)
-
-                    if i == 0:
-                        mel_streaming = sub_mel
-                    else:
-                        mel_streaming = np.concatenate(
-                            (mel_streaming, sub_mel), axis=0)
-
-                    # streaming voc
-                    # 当流式AM推理的mel帧数大于流式voc推理的chunk size，开始进行流式voc 推理
-                    while (mel_streaming.shape[0] >= end and
-                           voc_chunk_id < voc_chunk_num):
-                        if first_flag == 1:
-                            first_am_et = time.time()
-                            self.first_am_infer = first_am_et - frontend_et
-                        voc_chunk = mel_streaming[start:end, :]
-                        voc_chunk = paddle.to_tensor(voc_chunk)
-                        sub_wav = self.voc_inference(voc_chunk)
-
-                        sub_wav = self.depadding(sub_wav, voc_chunk_num,
-                                                 voc_chunk_id, voc_block,
-                                                 voc_pad, voc_upsample)
+                        first_am_et = time.time()
+                        self.first_am_infer = first_am_et - frontend_et
+
+                    # voc streaming
+                    voc_st = time.time()
+                    # the first voc chunk is yielded before the others are
+                    # inferred in one batch
+                    for sub_wav in self.voc_chunks_inference(mel):
                         if first_flag == 1:
                             first_voc_et = time.time()
                             self.first_voc_infer = first_voc_et - first_am_et
@@ -341,15 +564,76 @@ class TTSServerExecutor(TTSExecutor):
 
                         yield sub_wav
 
-                        voc_chunk_id += 1
-                        start = max(0, voc_chunk_id * voc_block - voc_pad)
-                        end = min((voc_chunk_id + 1) * voc_block + voc_pad,
-                                  mel_len)
-
-            else:
-                logger.error(
-                    "Only support fastspeech2_csmsc or fastspeech2_cnndecoder_csmsc on streaming tts."
-                )
+                # fastspeech2_cnndecoder_csmsc 
+                elif am == "fastspeech2_cnndecoder_csmsc":
+                    # am 
+                    orig_hs = self.am_inference.encoder_infer(
+                        paddle.to_tensor(part_phone_ids))
+
+                    # streaming voc chunk info
+                    mel_len = orig_hs.shape[1]
+                    voc_chunk_num = math.ceil(mel_len / self.voc_block)
+                    voc_slices = get_depadding_slices(voc_chunk_num, voc_block,
+                                                      voc_pad, voc_upsample)
+                    start = 0
+                    end = min(self.voc_block + self.voc_pad, mel_len)
+
+                    # streaming am
+                    hss = get_chunks(orig_hs, self.am_block, self.am_pad, "am")
+                    am_chunk_num = len(hss)
+                    for am_chunk_id, hs in enumerate(hss):
+                        before_outs = self.am_inference.decoder(hs)
+                        after_outs = before_outs + self.am_inference.postnet(
+                            before_outs.transpose((0, 2, 1))).transpose(
+                                (0, 2, 1))
+                        normalized_mel = after_outs[0]
+                        sub_mel = denorm(normalized_mel, self.am_mu,
+                                         self.am_std)
+                        sub_mel = self.depadding(sub_mel, am_chunk_num,
+                                                 am_chunk_id, am_block, am_pad,
+                                                 am_upsample)
+
+                        # keep the mel on device, so that the voc chunks are
+                        # sliced on device without copying them from host
+                        if am_chunk_id == 0:
+                            mel_streaming = sub_mel
+                        else:
+                            mel_streaming = paddle.concat(
+                                [mel_streaming, sub_mel], axis=0)
+
+                        # streaming voc
+                        # 当流式AM推理的mel帧数大于流式voc推理的chunk size，开始进行流式voc 推理
+                        while (mel_streaming.shape[0] >= end and
+                               voc_chunk_id < voc_chunk_num):
+                            if first_flag == 1:
+                                first_am_et = time.time()
+                                self.first_am_infer = first_am_et - frontend_et
+                            voc_chunk = mel_streaming[start:end, :]
+                            sub_wav = self.voc_graph_inference(
+                                self.voc_inference, voc_chunk)
+
+                            sub_wav = sub_wav[voc_slices[voc_chunk_id]]
+                            if first_flag == 1:
+                                first_voc_et = time.time()
+                                self.first_voc_infer = first_voc_et - first_am_et
+                                self.first_response_time = first_voc_et - frontend_st
+                                first_flag = 0
+
+                            yield sub_wav
+
+                            voc_chunk_id += 1
+                            start = max(0, voc_chunk_id * voc_block - voc_pad)
+                            end = min((voc_chunk_id + 1) * voc_block + voc_pad,
+                                      mel_len)
+
+                else:
+                    logger.error(
+                        "Only support fastspeech2_csmsc or fastspeech2_cnndecoder_csmsc on streaming tts."
+                    )
+        finally:
+            # also shut down when the client disconnects or infer fails
+            if am_pool is not None:
+                am_pool.shutdown(wait=False)
 
         self.final_response_time = time.time() - frontend_st
 
@@ -379,6 +663,11 @@ class TTSEngine(BaseEngine):
             config.voc_block > 0 and config.voc_pad > 0
         ), "Please set correct voc_block and voc_pad, they should be more than 0."
 
+        self.stream_encoding = config.get('stream_encoding', 'base64')
+        assert self.stream_encoding in {
+            'base64', 'pcm'
+        }, "Please set correct stream_encoding, it should be base64 or pcm."
+
         try:
             if self.config.device is not None:
                 self.device = self.config.device
@@ -416,6 +705,33 @@ class TTSEngine(BaseEngine):
                          (self.device))
             return False
 
+        # paddle inference predictors on cpu
+        if 'cpu' in self.device and self.config.get('cpu_inference', False):
+            try:
+                predictor_conf = dict(self.config.cpu_predictor_conf)
+                predictor_conf["device"] = "cpu"
+                self.executor.init_cpu_predictors(self.config.am,
+                                                  predictor_conf)
+                logger.info("Use paddle inference predictors on cpu.")
+            except Exception as e:
+                logger.error("Failed to create paddle inference predictors.")
+                logger.error(e)
+                return False
+
+        # cuda graph of voc inference
+        if self.config.get('voc_cuda_graph', False):
+            if 'gpu' in self.device and is_cuda_graph_supported():
+                self.executor.voc_cuda_graph = True
+                logger.info("Use cuda graph for voc inference.")
+            else:
+                logger.warning(
+                    "Cuda graph is not supported on device: %s, voc_cuda_graph is ignored."
+                    % (self.device))
+
+        # size of the buffers to convert the streaming wav chunks to pcm
+        voc_chunk_size = self.config.voc_block + 2 * self.config.voc_pad
+        self.max_chunk_samples = voc_chunk_size * self.executor.voc_upsample
+
         # warm up
         try:
             self.warm_up()
@@ -447,10 +763,16 @@ class TTSEngine(BaseEngine):
                 )
                 break
 
-    def preprocess(self, text_bese64: str=None, text_bytes: bytes=None):
+        if self.executor.voc_cuda_graph:
+            self.executor.init_voc_graphs(self.config.am)
+            logger.info(
+                f"Captured {len(self.executor.voc_graphs)} cuda graphs for voc inference."
+            )
+
+    def preprocess(self, text_b64: str=None, text_bytes: bytes=None):
         # Convert byte to text
-        if text_bese64:
-            text_bytes = base64.b64decode(text_bese64)  # base64 to bytes
+        if text_b64:
+            text_bytes = base64.b64decode(text_b64)  # base64 to bytes
         text = text_bytes.decode('utf-8')  # bytes to text
 
         return text
@@ -475,10 +797,14 @@ class TTSEngine(BaseEngine):
             None means do not save audio. Defaults to None.
 
         Returns:
-            wav_base64: The base64 format of the synthesized audio.
+            wav_base64: The base64 format of the synthesized audio, or the pcm
+            bytes if stream_encoding is pcm.
         """
 
-        wav_list = []
+        wav_len = 0
+        # buffers to convert the wav chunks of this request to pcm
+        float_buf = np.empty(self.max_chunk_samples, dtype=np.float32)
+        pcm_buf = np.empty(self.max_chunk_samples, dtype=np.int16)
 
         for wav in self.executor.infer(
                 text=sentence,
@@ -487,15 +813,11 @@ class TTSEngine(BaseEngine):
                 spk_id=spk_id, ):
 
             # wav type: <class 'numpy.ndarray'>  float32, convert to pcm (base64)
-            wav = float2pcm(wav)  # float32 to int16
-            wav_bytes = wav.tobytes()  # to bytes
-            wav_base64 = base64.b64encode(wav_bytes).decode('utf8')  # to base64
-            wav_list.append(wav)
-
-            yield wav_base64
+            yield encode_pcm_chunk(wav, float_buf, pcm_buf,
+                                   self.stream_encoding)
+            wav_len += wav.shape[0]
 
-        wav_all = np.concatenate(wav_list, axis=0)
-        duration = len(wav_all) / self.executor.am_config.fs
+        duration = wav_len / self.executor.am_config.fs
         logger.info(f"sentence: {sentence}")
         logger.info(f"The durations of audio is: {duration} s")
         logger.info(
@@ -505,4 +827,4 @@ class TTSEngine(BaseEngine):
         logger.info(f"RTF: {self.executor.final_response_time / duration}")
         logger.info(
             f"Other info: front time: {self.executor.frontend_time} s, first am infer time: {self.executor.first_am_infer} s, first voc infer time: {self.executor.first_voc_infer} s,"
-        )
\ No newline at end of file
+        )
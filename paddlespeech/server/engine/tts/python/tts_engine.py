@@ -11,20 +11,19 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import base64
-import io
 import time
 
-import librosa
 import numpy as np
 import paddle
 import soundfile as sf
-from scipy.io import wavfile
 
 from paddlespeech.cli.log import logger
 from paddlespeech.cli.tts.infer import TTSExecutor
 from paddlespeech.server.engine.base_engine import BaseEngine
 from paddlespeech.server.utils.audio_process import change_speed
+from paddlespeech.server.utils.audio_process import resample
+from paddlespeech.server.utils.audio_process import RESAMPLE_TYPES
+from paddlespeech.server.utils.audio_process import wav_array2base64
 from paddlespeech.server.utils.errors import ErrorCode
 from paddlespeech.server.utils.exception import ServerBaseException
 
@@ -53,6 +52,13 @@ class TTSEngine(BaseEngine):
         self.executor = TTSServerExecutor()
         self.config = config
 
+        self.res_type = self.config.get('res_type', 'soxr_hq')
+        if self.res_type not in RESAMPLE_TYPES:
+            logger.error(
+                f"res_type should be one of {RESAMPLE_TYPES}, but got {self.res_type}."
+            )
+            return False
+
         try:
             if self.config.device is not None:
                 self.device = self.config.device
@@ -141,27 +147,38 @@ class TTSEngine(BaseEngine):
             wav_base64: The base64 format of the synthesized audio.
         """
 
+        # fast path for the default parameters, the audio is not changed
+        if (target_fs in (0, original_fs) and volume == 1.0 and speed == 1.0 and
+                audio_path is None):
+            return original_fs, wav_array2base64(wav, original_fs)
+
         # transform sample_rate
-        if target_fs == 0 or target_fs > original_fs:
+        if target_fs == 0 or target_fs >= original_fs:
             target_fs = original_fs
             wav_tar_fs = wav
             logger.info(
                 "The sample rate of synthesized audio is the same as model, which is {}Hz".
                 format(original_fs))
         else:
-            wav_tar_fs = librosa.resample(
-                np.squeeze(wav), original_fs, target_fs)
+            wav_tar_fs = resample(
+                np.squeeze(wav), original_fs, target_fs, res_type=self.res_type)
             logger.info(
                 "The sample rate of model is {}Hz and the target sample rate is {}Hz. Converting the sample rate of the synthesized audio successfully.".
                 format(original_fs, target_fs))
         # transform volume
-        wav_vol = wav_tar_fs * volume
-        logger.info("Transform the volume of the audio successfully.")
+        if volume == 1.0:
+            wav_vol = wav_tar_fs
+        else:
+            wav_vol = wav_tar_fs * volume
+            logger.info("Transform the volume of the audio successfully.")
 
         # transform speed
         try:  # windows not support soxbindings
-            wav_speed = change_speed(wav_vol, speed, target_fs)
-            logger.info("Transform the speed of the audio successfully.")
+            if speed == 1.0:
+                wav_speed = wav_vol
+            else:
+                wav_speed = change_speed(wav_vol, speed, target_fs)
+                logger.info("Transform the speed of the audio successfully.")
         except ServerBaseException:
             raise ServerBaseException(
                 ErrorCode.SERVER_INTERNAL_ERR,
@@ -171,10 +188,7 @@ class TTSEngine(BaseEngine):
             logger.error("Failed to transform speed.")
 
         # wav to base64
-        buf = io.BytesIO()
-        wavfile.write(buf, target_fs, wav_speed)
-        base64_bytes = base64.b64encode(buf.read())
-        wav_base64 = base64_bytes.decode('utf-8')
+        wav_base64 = wav_array2base64(wav_speed, target_fs)
         logger.info("Audio to string successfully.")
 
         # save audio
@@ -182,10 +196,16 @@ class TTSEngine(BaseEngine):
             if audio_path.endswith(".wav"):
                 sf.write(audio_path, wav_speed, target_fs)
             elif audio_path.endswith(".pcm"):
-                wav_norm = wav_speed * (32767 / max(0.001,
-                                                    np.max(np.abs(wav_speed))))
+                peak = max(-float(wav_speed.min()), float(wav_speed.max()))
+                # scale and cast to int16 in one pass
+                wav_norm = np.empty(wav_speed.shape, dtype=np.int16)
+                np.multiply(
+                    wav_speed,
+                    32767 / max(0.001, peak),
+                    out=wav_norm,
+                    casting='unsafe')
                 with open(audio_path, "wb") as f:
-                    f.write(wav_norm.astype(np.int16))
+                    f.write(wav_norm)
             logger.info("Save audio to {} successfully.".format(audio_path))
         else:
             logger.info("There is no need to save audio.")
@@ -136,4 +136,10 @@ async def stream_tts(request_body: TTSRequest):
     tts_engine = engine_pool['tts']
     logger.info("Get tts engine successfully.")
 
-    return StreamingResponse(tts_engine.run(sentence=text))
+    # stream_encoding is pcm, tell the client that the chunks are raw bytes
+    media_type = None
+    if getattr(tts_engine, 'stream_encoding', 'base64') == 'pcm':
+        media_type = "application/octet-stream"
+
+    return StreamingResponse(
+        tts_engine.run(sentence=text), media_type=media_type)
@@ -324,8 +324,12 @@ class TTSWsHandler:
             # 4. Process the received response
             message = await ws.recv()
             first_response = time.time() - st
-            message = json.loads(message)
-            status = message["status"]
+            # stream_encoding is pcm, the audio is sent as binary frames
+            if isinstance(message, bytes):
+                status = 1
+            else:
+                message = json.loads(message)
+                status = message["status"]
             while True:
                 # When throw an exception
                 if status == -1:
@@ -360,8 +364,11 @@ class TTSWsHandler:
                 # Return the audio stream normally
                 elif status == 1:
                     receive_time_list.append(time.time())
-                    audio = message["audio"]
-                    audio = base64.b64decode(audio)  # bytes
+                    if isinstance(message, bytes):
+                        audio = message
+                    else:
+                        audio = message["audio"]
+                        audio = base64.b64decode(audio)  # bytes
                     chunk_duration_list.append(len(audio) / 2.0 / 24000)
                     all_bytes += audio
                     if self.play:
@@ -373,8 +380,11 @@ class TTSWsHandler:
                             self.start_play = False
 
                     message = await ws.recv()
-                    message = json.loads(message)
-                    status = message["status"]
+                    if isinstance(message, bytes):
+                        status = 1
+                    else:
+                        message = json.loads(message)
+                        status = message["status"]
 
                 else:
                     logger.error("infer error, return status is invalid.")
@@ -466,10 +476,14 @@ class TTSHttpHandler:
         st = time.time()
         html = requests.post(self.url, json.dumps(params), stream=True)
 
+        # stream_encoding is pcm, the chunks are raw pcm bytes
+        pcm = html.headers.get("Content-Type",
+                               "").startswith("application/octet-stream")
+
         # 3. Process the received response 
         for chunk in html.iter_content(chunk_size=None):
             receive_time_list.append(time.time())
-            audio = base64.b64decode(chunk)  # bytes
+            audio = chunk if pcm else base64.b64decode(chunk)  # bytes
             if first_flag:
                 first_response = time.time() - st
                 first_flag = 0
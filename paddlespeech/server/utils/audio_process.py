@@ -11,13 +11,26 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import base64
+import io
 import os
 import wave
 
+import librosa
 import numpy as np
+from scipy.io import wavfile
 
 from paddlespeech.cli.log import logger
 
+try:
+    import soxr
+except ImportError:
+    soxr = None
+
+# soxr qualities and the res_type of librosa.resample
+RESAMPLE_TYPES = ('soxr_vhq', 'soxr_hq', 'soxr_mq', 'soxr_lq', 'soxr_qq',
+                  'kaiser_best', 'kaiser_fast', 'polyphase', 'fft', 'scipy')
+
 
 def wav2pcm(wavfile, pcmfile, data_type=np.int16):
     """ Save the wav file as a pcm file
@@ -106,6 +119,35 @@ def change_speed(sample_raw, speed_rate, sample_rate):
     return sample_speed
 
 
+def resample(sample_raw, orig_sr, target_sr, res_type='soxr_hq'):
+    """Change the sample rate of the audio.
+
+    Args:
+        sample_raw (numpy.ndarray): audio samples, float
+        orig_sr (int): original sample rate
+        target_sr (int): target sample rate
+        res_type (str, optional): resample type, one of RESAMPLE_TYPES, 'soxr_*'
+            or the res_type of librosa.resample. Defaults to 'soxr_hq'.
+
+    Returns:
+        numpy.ndarray: resampled audio samples
+    """
+    if res_type not in RESAMPLE_TYPES:
+        raise ValueError(f"res_type should be one of {RESAMPLE_TYPES}, "
+                         f"but got {res_type}.")
+    if res_type.startswith('soxr'):
+        if soxr is not None:
+            # soxr quality: VHQ, HQ, MQ, LQ, QQ
+            quality = res_type[len('soxr_'):].upper()
+            return soxr.resample(sample_raw, orig_sr, target_sr, quality)
+        logger.warning(
+            "Can not import soxr, use kaiser_fast to resample audio.")
+        res_type = 'kaiser_fast'
+
+    return librosa.resample(
+        sample_raw, orig_sr=orig_sr, target_sr=target_sr, res_type=res_type)
+
+
 def float2pcm(sig, dtype='int16'):
     """Convert floating point signal with a range from -1 to 1 to PCM16.
 
@@ -129,6 +171,76 @@ def float2pcm(sig, dtype='int16'):
     return (sig * abs_max + offset).clip(i.min, i.max).astype(dtype)
 
 
+def float2pcm_buffer(sig, float_buf, pcm_buf):
+    """Convert float32 signal with a range from -1 to 1 to PCM16 in
+    preallocated buffers, the result is the same as float2pcm(sig).
+    Other float types or signals longer than the buffers are converted
+    by float2pcm.
+
+    Args:
+        sig (array): Input array, must have floating point type.
+        float_buf (numpy.ndarray): float32 buffer.
+        pcm_buf (numpy.ndarray): int16 buffer, the same length as float_buf.
+
+    Returns:
+        numpy.ndarray: int16 data, a view of pcm_buf if the buffers are used.
+    """
+    sig = np.asarray(sig).reshape(-1)
+    if sig.dtype.kind != 'f':
+        raise TypeError("'sig' must be a float array")
+    if sig.dtype != np.float32 or sig.shape[0] > pcm_buf.shape[0]:
+        return float2pcm(sig)
+
+    i = np.iinfo(np.int16)
+    n = sig.shape[0]
+    scaled = float_buf[:n]
+    pcm = pcm_buf[:n]
+    np.multiply(sig, 2**(i.bits - 1), out=scaled)
+    np.clip(scaled, i.min, i.max, out=scaled)
+    np.copyto(pcm, scaled, casting='unsafe')
+    return pcm
+
+
+def encode_pcm_chunk(wav, float_buf, pcm_buf, encoding: str='base64'):
+    """Convert a float32 wav chunk to pcm bytes or the base64 format of them.
+
+    Args:
+        wav (numpy.ndarray): float32 wav chunk
+        float_buf (numpy.ndarray): float32 buffer used by float2pcm_buffer
+        pcm_buf (numpy.ndarray): int16 buffer used by float2pcm_buffer
+        encoding (str, optional): 'pcm' or 'base64'. Defaults to 'base64'.
+
+    Returns:
+        bytes or str: pcm bytes if encoding is 'pcm', otherwise their base64
+            string.
+    """
+    wav = float2pcm_buffer(wav, float_buf, pcm_buf)  # float32 to int16
+    wav_bytes = wav.tobytes()  # to bytes
+    if encoding == 'pcm':
+        return wav_bytes
+    return base64.b64encode(wav_bytes).decode('ascii')  # to base64
+
+
+def wav_array2base64(wav, fs: int):
+    """Convert wav samples to the base64 format of a wav file.
+
+    Args:
+        wav (numpy.ndarray): audio sample points
+        fs (int): audio sample rate
+
+    Returns:
+        str: The base64 format of the wav file.
+    """
+    # preallocate the buffer with the wav header size (at most 64 bytes)
+    # and data size, so that writing the wav does not reallocate it
+    buf = io.BytesIO(bytearray(64 + wav.nbytes))
+    wavfile.write(buf, fs, wav)
+    # the wav length is the riff chunk size + 8
+    wav_size = int.from_bytes(buf.getbuffer()[4:8], 'little') + 8
+    base64_bytes = base64.b64encode(buf.getbuffer()[:wav_size])
+    return base64_bytes.decode('utf-8')
+
+
 def pcm2float(data):
     """pcm int16 to float32
     Args:
@@ -51,6 +51,16 @@ def init_predictor(model_dir: Optional[os.PathLike]=None,
     if "gpu" in device:
         gpu_id = device.split(":")[-1]
         config.enable_use_gpu(1000, int(gpu_id))
+    else:
+        config.disable_gpu()
+        if predictor_conf.get("cpu_threads"):
+            config.set_cpu_math_library_num_threads(
+                predictor_conf["cpu_threads"])
+        # mkldnn (oneDNN) kernels on cpu
+        if predictor_conf.get("enable_mkldnn", False):
+            config.enable_mkldnn()
+            if predictor_conf.get("enable_mkldnn_bfloat16", False):
+                config.enable_mkldnn_bfloat16()
 
     # IR optim
     if predictor_conf["switch_ir_optim"]:
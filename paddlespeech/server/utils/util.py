@@ -77,6 +77,36 @@ def get_chunks(data, block_size, pad_size, step):
     return chunks
 
 
+def get_depadding_slices(chunk_num, block_size, pad_size, upsample):
+    """The slices to remove the padding of the outputs of the voc chunks
+    from get_chunks, they only depend on the chunk id.
+
+    Args:
+        chunk_num (int): number of chunks
+        block_size (int): block size of get_chunks
+        pad_size (int): pad size of get_chunks
+        upsample (int): output samples per input frame
+
+    Returns:
+        list: slices list
+    """
+    slices = []
+    for chunk_id in range(chunk_num):
+        front_pad = min(chunk_id * block_size, pad_size)
+        # first chunk
+        if chunk_id == 0:
+            slices.append(slice(0, block_size * upsample))
+        # last chunk
+        elif chunk_id == chunk_num - 1:
+            slices.append(slice(front_pad * upsample, None))
+        # middle chunk
+        else:
+            slices.append(
+                slice(front_pad * upsample, (front_pad + block_size) *
+                      upsample))
+    return slices
+
+
 def compute_delay(receive_time_list, chunk_duration_list):
     """compute delay 
         Args:
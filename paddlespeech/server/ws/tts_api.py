@@ -74,8 +74,8 @@ async def websocket_endpoint(websocket: WebSocket):
 
             # speech synthesis request 
             elif 'text' in message:
-                text_bese64 = message["text"]
-                sentence = tts_engine.preprocess(text_bese64=text_bese64)
+                text_b64 = message["text"]
+                sentence = tts_engine.preprocess(text_b64=text_b64)
 
                 # run
                 wav_generator = tts_engine.run(sentence)
@@ -83,8 +83,12 @@ async def websocket_endpoint(websocket: WebSocket):
                 while True:
                     try:
                         tts_results = next(wav_generator)
-                        resp = {"status": 1, "audio": tts_results}
-                        await websocket.send_json(resp)
+                        # stream_encoding is pcm, send the pcm bytes directly
+                        if isinstance(tts_results, bytes):
+                            await websocket.send_bytes(tts_results)
+                        else:
+                            resp = {"status": 1, "audio": tts_results}
+                            await websocket.send_json(resp)
                     except StopIteration as e:
                         resp = {"status": 2, "audio": ''}
                         await websocket.send_json(resp)
@@ -58,6 +58,7 @@ base = [
     "scipy",
     "sentencepiece~=0.1.96",
     "soundfile~=0.10",
+    "soxr",
     "textgrid",
     "timer",
     "tqdm",
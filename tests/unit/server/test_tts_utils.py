@@ -0,0 +1,100 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import base64
+import io
+
+import librosa
+import numpy as np
+import pytest
+from scipy.io import wavfile
+
+from paddlespeech.server.utils import audio_process
+from paddlespeech.server.utils.audio_process import encode_pcm_chunk
+from paddlespeech.server.utils.audio_process import float2pcm
+from paddlespeech.server.utils.audio_process import float2pcm_buffer
+from paddlespeech.server.utils.audio_process import resample
+from paddlespeech.server.utils.audio_process import wav_array2base64
+from paddlespeech.server.utils.util import get_chunks
+from paddlespeech.server.utils.util import get_depadding_slices
+
+
+@pytest.mark.parametrize("mel_len", [1, 13, 36, 37, 50, 51, 72, 100])
+@pytest.mark.parametrize("block, pad", [(36, 14), (12, 5), (20, 20)])
+def test_voc_chunks_depadding(mel_len, block, pad):
+    upsample = 4
+    mel = np.random.randn(mel_len, 2).astype(np.float32)
+    mel_chunks = get_chunks(mel, block, pad, "voc")
+    voc_slices = get_depadding_slices(len(mel_chunks), block, pad, upsample)
+    # a vocoder which repeats every frame upsample times
+    sub_wavs = [
+        np.repeat(mel_chunk, upsample, axis=0)[voc_slice]
+        for mel_chunk, voc_slice in zip(mel_chunks, voc_slices)
+    ]
+
+    assert sum(len(sub_wav) for sub_wav in sub_wavs) == mel_len * upsample
+    np.testing.assert_array_equal(
+        np.concatenate(sub_wavs), np.repeat(mel, upsample, axis=0))
+
+
+def test_float2pcm_buffer():
+    float_buf = np.empty(1024, dtype=np.float32)
+    pcm_buf = np.empty(1024, dtype=np.int16)
+    for n in [1, 512, 1024, 2048]:
+        sig = np.random.uniform(-1.2, 1.2, size=(n, 1)).astype(np.float32)
+        pcm = float2pcm_buffer(sig, float_buf, pcm_buf)
+        assert pcm.tobytes() == float2pcm(sig).tobytes()
+        # float64 is converted by float2pcm
+        sig = sig.astype(np.float64)
+        pcm = float2pcm_buffer(sig, float_buf, pcm_buf)
+        assert pcm.tobytes() == float2pcm(sig).tobytes()
+
+
+def test_encode_pcm_chunk():
+    float_buf = np.empty(1024, dtype=np.float32)
+    pcm_buf = np.empty(1024, dtype=np.int16)
+    wav = np.random.uniform(-1, 1, size=(600, 1)).astype(np.float32)
+    pcm_bytes = float2pcm(wav).tobytes()
+
+    assert encode_pcm_chunk(wav, float_buf, pcm_buf, 'pcm') == pcm_bytes
+    assert base64.b64decode(
+        encode_pcm_chunk(wav, float_buf, pcm_buf, 'base64')) == pcm_bytes
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.int16])
+def test_wav_array2base64(dtype):
+    wav = np.random.uniform(-1, 1, size=(24000, 1))
+    if dtype == np.int16:
+        wav = float2pcm(wav)
+    wav = wav.astype(dtype)
+
+    buf = io.BytesIO()
+    wavfile.write(buf, 24000, wav)
+    wav_base64 = base64.b64encode(buf.read()).decode('utf-8')
+
+    assert wav_array2base64(wav, 24000) == wav_base64
+
+
+def test_resample():
+    wav = np.random.uniform(-1, 1, size=24000).astype(np.float32)
+
+    np.testing.assert_allclose(
+        resample(wav, 24000, 16000, res_type='kaiser_fast'),
+        librosa.resample(
+            wav, orig_sr=24000, target_sr=16000, res_type='kaiser_fast'))
+    if audio_process.soxr is not None:
+        np.testing.assert_allclose(
+            resample(wav, 24000, 16000, res_type='soxr_hq'),
+            audio_process.soxr.resample(wav, 24000, 16000, 'HQ'))
+    with pytest.raises(ValueError):
+        resample(wav, 24000, 16000, res_type='soxr_foo')
@@ -0,0 +1,68 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import paddle
+import pytest
+
+from paddlespeech.server.engine.tts.online.python.tts_engine import VocBatchInference
+from paddlespeech.t2s.models.hifigan import HiFiGANGenerator
+from paddlespeech.t2s.models.hifigan import HiFiGANInference
+from paddlespeech.t2s.models.melgan import MelGANGenerator
+from paddlespeech.t2s.models.melgan import MelGANInference
+from paddlespeech.t2s.modules.normalizer import ZScore
+
+paddle.set_device("cpu")
+
+
+def get_voc_inference(voc_name, n_mels):
+    normalizer = ZScore(
+        paddle.randn([n_mels]), paddle.uniform([n_mels], min=0.5, max=1.5))
+    if voc_name == "mb_melgan":
+        # out_channels > 1 uses pqmf to merge the sub-bands
+        generator = MelGANGenerator(
+            in_channels=n_mels,
+            out_channels=4,
+            channels=32,
+            upsample_scales=[4, 2],
+            stacks=2)
+        generator.remove_weight_norm()
+        voc_inference = MelGANInference(normalizer, generator)
+    else:
+        generator = HiFiGANGenerator(
+            in_channels=n_mels,
+            channels=32,
+            upsample_scales=(4, 2),
+            upsample_kernel_sizes=(8, 4),
+            resblock_kernel_sizes=(3, 5),
+            resblock_dilations=[(1, 3), (1, 3)])
+        generator.remove_weight_norm()
+        voc_inference = HiFiGANInference(normalizer, generator)
+    voc_inference.eval()
+    return voc_inference
+
+
+@pytest.mark.parametrize("voc_name", ["mb_melgan", "hifigan"])
+def test_voc_batch_inference(voc_name):
+    n_mels = 16
+    voc_inference = get_voc_inference(voc_name, n_mels)
+    voc_batch_inference = VocBatchInference(voc_inference, voc_name)
+    mel_chunks = [paddle.randn([30, n_mels]) for _ in range(3)]
+
+    with paddle.no_grad():
+        wavs = voc_batch_inference(paddle.stack(mel_chunks))
+        for i, mel_chunk in enumerate(mel_chunks):
+            wav = voc_inference(mel_chunk)
+            assert wavs[i].shape == wav.shape
+            np.testing.assert_allclose(
+                wavs[i].numpy(), wav.numpy(), rtol=1e-5, atol=1e-5)